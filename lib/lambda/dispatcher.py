@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+
+logger = Logger()
+
+MAX_WORKERS = 10
+
+OPERATION_PREFERENCES = {
+    "RegionConcurrencyType": "PARALLEL",
+    "MaxConcurrentCount": 10,
+    "ConcurrencyMode": "SOFT_FAILURE_TOLERANCE",
+}
+
+# Each StackSet is retried individually, replacing the retry policy the scheduler applied to
+# each per-StackSet target. The adaptive mode also rate limits the threads once throttled. The
+# function timeout is sized from these limits, and the pool fits the thread pool.
+client_config = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    connect_timeout=1,
+    read_timeout=3,
+    tcp_keepalive=True,
+    max_pool_connections=MAX_WORKERS,
+)
+
+cfn_client = boto3.client("cloudformation", config=client_config)
+
+
+def detect_stackset_drift(stackset_name: str) -> str:
+    response = cfn_client.detect_stack_set_drift(
+        StackSetName=stackset_name,
+        OperationPreferences=OPERATION_PREFERENCES,
+    )
+
+    logger.info(
+        "Drift detection started.",
+        extra={"stackset_name": stackset_name, "operation_id": response["OperationId"]},
+    )
+    return response["OperationId"]
+
+
+def lambda_handler(event, _):
+    logger.info("Event received", extra={"event": event})
+
+    stackset_names: list[str] = event["StackSetNames"]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            stackset_name: executor.submit(detect_stackset_drift, stackset_name)
+            for stackset_name in stackset_names
+        }
+
+    failed_stackset_names = []
+
+    for stackset_name, future in futures.items():
+        try:
+            future.result()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Failed to start the drift detection.", extra={"stackset_name": stackset_name}
+            )
+            failed_stackset_names.append(stackset_name)
+
+    if failed_stackset_names:
+        raise RuntimeError(
+            f"Failed to start the drift detection of StackSets: {', '.join(failed_stackset_names)}"
+        )
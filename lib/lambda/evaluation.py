@@ -1,32 +1,80 @@
-import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import boto3
+import orjson
 from aws_lambda_powertools import Logger
+from botocore.config import Config
 
 logger = Logger()
 
 AWS_REGION = os.environ["AWS_REGION"]
 NOTIFICATION_TOPIC_ARN = os.environ["NOTIFICATION_TOPIC_ARN"]
 
-cfn_client = boto3.client("cloudformation")
-sns_client = boto3.client("sns")
+# Maximum number of entries accepted by a single SNS PublishBatch request
+PUBLISH_BATCH_SIZE = 10
+
+# Captures the stackset name from an "arn:...:stackset/<name>:<id>" ARN
+STACKSET_ARN_PATTERN = re.compile(r":stackset/([^:]+):")
+
+# Shared by both clients so warm invocations reuse the kept-alive connections. A call takes at
+# most 2 attempts of 1s connect + 3s read plus the backoff, which the function timeout accounts
+# for, and the pool fits the thread pool.
+client_config = Config(
+    retries={"mode": "standard", "max_attempts": 2},
+    connect_timeout=1,
+    read_timeout=3,
+    tcp_keepalive=True,
+    max_pool_connections=PUBLISH_BATCH_SIZE,
+)
+
+# Created at module scope so the initialized clients are captured in the SnapStart snapshot. No
+# connection is opened before the snapshot, as it would not survive the restore.
+cfn_client = boto3.client("cloudformation", config=client_config)
+sns_client = boto3.client("sns", config=client_config)
+
+
+def publish_to_topic(notifications: list[tuple[str, str, dict]]) -> list[str]:
+    """
+    Publishes the (id, subject, message) notifications in batches and returns the ids of the
+    notifications SNS failed to accept.
+    """
+    entries = [
+        {
+            "Id": notification_id,
+            "Subject": subject,
+            "Message": orjson.dumps(message, default=str, option=orjson.OPT_NAIVE_UTC).decode(),
+        }
+        for notification_id, subject, message in notifications
+    ]
+
+    failed_ids = []
+
+    for i in range(0, len(entries), PUBLISH_BATCH_SIZE):
+        response = sns_client.publish_batch(
+            TopicArn=NOTIFICATION_TOPIC_ARN,
+            PublishBatchRequestEntries=entries[i : i + PUBLISH_BATCH_SIZE],
+        )
 
+        for failure in response.get("Failed", []):
+            logger.error("Failed to publish the notification.", extra={"failure": failure})
+            failed_ids.append(failure["Id"])
 
-def publish_to_topic(subject: str, message: dict):
-    return sns_client.publish(
-        TopicArn=NOTIFICATION_TOPIC_ARN,
-        Subject=subject,
-        Message=json.dumps({"default": message}, default=str),
-    )
+    return failed_ids
 
 
-def lambda_handler(event, _):
+def evaluate_operation(event: dict) -> Optional[tuple[str, dict]]:
+    """
+    Evaluates the stackset operation referenced by the event and returns the (subject, message)
+    notification to publish, or None if all stackset instances are in sync.
+    """
     logger.info("Event received", extra={"event": event})
 
     detail: dict = event["detail"]
     stackset_arn: str = detail["stack-set-arn"]
-    stackset_name = stackset_arn.split(":stackset/")[1].split(":")[0]
+    stackset_name = STACKSET_ARN_PATTERN.search(stackset_arn).group(1)
     stackset_operation_id = detail["stack-set-operation-id"]
 
     logger.info("Fetching the stackset operation details.")
@@ -57,12 +105,7 @@ def lambda_handler(event, _):
             },
         )
 
-        publish_to_topic(
-            subject=f"ERROR: StackSet {stackset_name} drift detection failed",
-            message=operation_details,
-        )
-
-        return
+        return f"ERROR: StackSet {stackset_name} drift detection failed", operation_details
 
     if stackset_drift_status != "IN_SYNC":
         total_count = stackset_drift_detection_details.get("TotalStackInstancesCount")
@@ -77,15 +120,43 @@ def lambda_handler(event, _):
             },
         )
 
-        publish_to_topic(
-            subject=f"DRIFTED: StackSet {stackset_name} is in the drifted state",
-            message=operation_details,
-        )
-
-        return
+        return f"DRIFTED: StackSet {stackset_name} is in the drifted state", operation_details
 
     logger.info(
         "Drift detection completed successfully, and all instances of %s stackset are in sync.",
         stackset_name,
     )
-    return
+    return None
+
+
+def evaluate_record(record: dict) -> Optional[tuple[str, dict]]:
+    return evaluate_operation(orjson.loads(record["body"]))
+
+
+def lambda_handler(event, _):
+    notifications = []
+    failed_ids = []
+
+    # Overlap the DescribeStackSetOperation round-trips of the records in the batch
+    with ThreadPoolExecutor(max_workers=PUBLISH_BATCH_SIZE) as executor:
+        futures = {
+            record["messageId"]: executor.submit(evaluate_record, record)
+            for record in event["Records"]
+        }
+
+    for message_id, future in futures.items():
+        try:
+            notification = future.result()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to evaluate the record.", extra={"message_id": message_id})
+            failed_ids.append(message_id)
+            continue
+
+        if notification is not None:
+            subject, message = notification
+            notifications.append((message_id, subject, message))
+
+    # The SQS message ids double as the batch entry ids, so SNS failures map back to records
+    failed_ids.extend(publish_to_topic(notifications))
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_ids]}
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+
+logger = Logger()
+
+# SNS has no batch subscribe API, so the Subscribe/Unsubscribe calls are issued concurrently
+MAX_WORKERS = 10
+
+# Bounds each Subscribe/Unsubscribe call to 3 attempts of 1s connect + 3s read, so a stalled
+# call cannot take up the whole custom resource timeout
+client_config = Config(
+    retries={"mode": "standard"},
+    connect_timeout=1,
+    read_timeout=3,
+    tcp_keepalive=True,
+    max_pool_connections=MAX_WORKERS,
+)
+
+sns_client = boto3.client("sns", config=client_config)
+
+
+def subscription_key(subscription: dict) -> tuple[str, str]:
+    return subscription["Protocol"], subscription["Endpoint"]
+
+
+def subscribe(topic_arn: str, subscriptions: list[dict]) -> list[str]:
+    if not subscriptions:
+        return []
+
+    def _subscribe(subscription: dict) -> str:
+        response = sns_client.subscribe(
+            TopicArn=topic_arn,
+            Protocol=subscription["Protocol"],
+            Endpoint=subscription["Endpoint"],
+            ReturnSubscriptionArn=True,
+        )
+        return response["SubscriptionArn"]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        subscription_arns = list(executor.map(_subscribe, subscriptions))
+
+    logger.info("Endpoints subscribed.", extra={"subscription_arns": subscription_arns})
+    return subscription_arns
+
+
+def unsubscribe(topic_arn: str, subscriptions: list[dict]) -> list[str]:
+    if not subscriptions:
+        return []
+
+    keys = {subscription_key(subscription) for subscription in subscriptions}
+
+    # Subscriptions pending confirmation have no ARN yet and expire on their own
+    paginator = sns_client.get_paginator("list_subscriptions_by_topic")
+    subscription_arns = [
+        subscription["SubscriptionArn"]
+        for page in paginator.paginate(TopicArn=topic_arn)
+        for subscription in page["Subscriptions"]
+        if subscription_key(subscription) in keys
+        and subscription["SubscriptionArn"].startswith("arn:")
+    ]
+
+    def _unsubscribe(subscription_arn: str):
+        sns_client.unsubscribe(SubscriptionArn=subscription_arn)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(_unsubscribe, subscription_arns))
+
+    logger.info("Endpoints unsubscribed.", extra={"subscription_arns": subscription_arns})
+    return subscription_arns
+
+
+def on_event(event, _):
+    logger.info("Event received", extra={"event": event})
+
+    request_type = event["RequestType"]
+    properties = event["ResourceProperties"]
+    topic_arn = properties["TopicArn"]
+    subscriptions = properties.get("Subscriptions", [])
+
+    if request_type == "Create":
+        subscribe(topic_arn, subscriptions)
+
+    elif request_type == "Update":
+        old_properties = event["OldResourceProperties"]
+        old_subscriptions = old_properties.get("Subscriptions", [])
+
+        if old_properties["TopicArn"] != topic_arn:
+            # The physical ID changes, so CloudFormation deletes the old subscriptions afterwards
+            subscribe(topic_arn, subscriptions)
+        else:
+            keys = {subscription_key(subscription) for subscription in subscriptions}
+            old_keys = {subscription_key(subscription) for subscription in old_subscriptions}
+
+            unsubscribe(
+                topic_arn,
+                [s for s in old_subscriptions if subscription_key(s) not in keys],
+            )
+            subscribe(
+                topic_arn,
+                [s for s in subscriptions if subscription_key(s) not in old_keys],
+            )
+
+    elif request_type == "Delete":
+        unsubscribe(topic_arn, subscriptions)
+
+    return {"PhysicalResourceId": topic_arn}
@@ -1,19 +1,34 @@
 import json
 from typing import Optional
 
+import aws_cdk.aws_cloudwatch as cloudwatch
+import aws_cdk.aws_cloudwatch_actions as cloudwatch_actions
 import aws_cdk.aws_events as events
 import aws_cdk.aws_events_targets as targets
 import aws_cdk.aws_iam as iam
 import aws_cdk.aws_lambda as _lambda
 import aws_cdk.aws_lambda_destinations as destinations
+import aws_cdk.aws_lambda_event_sources as event_sources
 import aws_cdk.aws_logs as logs
 import aws_cdk.aws_scheduler as scheduler
 import aws_cdk.aws_sns as sns
-import aws_cdk.aws_sns_subscriptions as subscriptions
 import aws_cdk.aws_sqs as sqs
-from aws_cdk import Duration, RemovalPolicy, Stack
+import aws_cdk.custom_resources as cr
+from aws_cdk import BundlingOptions, CustomResource, Duration, RemovalPolicy, Stack
 from constructs import Construct
 
+# The evaluation function makes two sequential rounds of calls (the concurrent
+# DescribeStackSetOperation calls, then PublishBatch). Each call takes at most 2 attempts of 1s
+# connect + 3s read timeouts plus up to 1s of backoff, so 18s in the worst case.
+EVALUATION_FUNCTION_TIMEOUT = Duration.seconds(30)
+EVALUATION_BATCHING_WINDOW = Duration.seconds(5)
+
+# Each DetectStackSetDrift call of the dispatcher takes at most 10 attempts of 1s connect + 3s
+# read timeouts plus about 111s of capped exponential backoff, so roughly 150s in the worst case.
+# The dispatcher runs 10 calls at a time, and the Lambda maximum of 15 minutes covers 5 such
+# rounds, i.e. 50 StackSets that all exhaust their retries.
+DISPATCHER_FUNCTION_TIMEOUT = Duration.minutes(15)
+
 
 class StacksetDriftDetectionStackProps:
     def __init__(
@@ -31,7 +46,8 @@ class StacksetDriftDetectionStackProps:
         :param notification_email_endpoints: A list of email addresses to subscribe to the SNS topic
         :param notification_https_endpoints: A list of HTTPS endpoints to subscribe to the SNS topic
         """
-        self.stackset_names = stackset_names
+        # Duplicates would add redundant event pattern matchers and conflicting drift detections
+        self.stackset_names = list(dict.fromkeys(stackset_names))
         self.schedule_expression = schedule_expression
         self.notification_email_endpoints = notification_email_endpoints or []
         self.notification_https_endpoints = notification_https_endpoints or []
@@ -49,11 +65,53 @@ class StacksetDriftDetectionStack(Stack):
 
         self._props = props
 
+        # The function dependencies are bundled with the code rather than attached as the
+        # Powertools layer, which ships (and imports) far more than the Logger we use
+        self._function_code = _lambda.Code.from_asset(
+            "lib/lambda",
+            bundling=BundlingOptions(
+                image=_lambda.Runtime.PYTHON_3_12.bundling_image,
+                # The container runs natively, and pip resolves the wheels for the ARM64
+                # (Graviton) function architecture
+                command=[
+                    "bash",
+                    "-c",
+                    "pip install --platform manylinux2014_aarch64 --only-binary=:all: "
+                    "--python-version 3.12 -r requirements.txt -t /asset-output "
+                    "&& cp -au . /asset-output",
+                ],
+            ),
+        )
+
         self._notification_topic = self._create_notification_topic()
-        self._schedulers = self._create_schedulers()
+        self._scheduler_dead_letter_queue = self._create_scheduler_dead_letter_queue(
+            self._notification_topic
+        )
+        self._dispatcher_function = self._create_dispatcher_function(
+            self._scheduler_dead_letter_queue
+        )
+        self._scheduler = self._create_scheduler(
+            self._dispatcher_function, self._scheduler_dead_letter_queue
+        )
+        self._evaluation_queue = self._create_evaluation_queue(self._notification_topic)
         self._evaluation_function = self._create_evaluation_function(self._notification_topic)
+        # SnapStart only applies to published versions, so the queue invokes the alias
+        self._evaluation_function_alias = _lambda.Alias(
+            self,
+            "EvaluationFunctionAlias",
+            alias_name="live",
+            version=self._evaluation_function.current_version,
+        )
+        self._evaluation_function_alias.add_event_source(
+            event_sources.SqsEventSource(
+                self._evaluation_queue,
+                batch_size=10,
+                max_batching_window=EVALUATION_BATCHING_WINDOW,
+                report_batch_item_failures=True,
+            )
+        )
         self._drift_status_rule = self._create_drift_status_eb_rule()
-        self._drift_status_rule.add_target(targets.LambdaFunction(self._evaluation_function))
+        self._drift_status_rule.add_target(targets.SqsQueue(self._evaluation_queue))
 
     def _create_notification_topic(self):
         topic = sns.Topic(
@@ -62,31 +120,162 @@ class StacksetDriftDetectionStack(Stack):
             enforce_ssl=True,
         )
 
-        for email in self._props.notification_email_endpoints:
-            topic.add_subscription(
-                subscriptions.EmailSubscription(
-                    email_address=email,
-                    json=True,
-                )
+        subscriptions = [
+            {"Protocol": "email-json", "Endpoint": email}
+            for email in self._props.notification_email_endpoints
+        ] + [
+            {"Protocol": "https", "Endpoint": endpoint}
+            for endpoint in self._props.notification_https_endpoints
+        ]
+
+        if subscriptions:
+            # All endpoints are subscribed by a single custom resource instead of one
+            # CloudFormation resource per endpoint
+            provider = cr.Provider(
+                self,
+                "SubscriptionsProvider",
+                on_event_handler=self._create_subscriptions_function(topic),
             )
 
-        for endpoint in self._props.notification_https_endpoints:
-            topic.add_subscription(
-                subscriptions.UrlSubscription(
-                    url=endpoint,
-                    protocol=sns.SubscriptionProtocol.HTTPS,
-                )
+            CustomResource(
+                self,
+                "DeliveryTopicSubscriptions",
+                service_token=provider.service_token,
+                properties={
+                    "TopicArn": topic.topic_arn,
+                    "Subscriptions": subscriptions,
+                },
             )
 
         return topic
 
-    def _create_schedulers(self):
+    def _create_subscriptions_function(self, topic: sns.Topic):
+        log_group = logs.LogGroup(
+            self,
+            "SubscriptionsFunctionLogGroup",
+            removal_policy=RemovalPolicy.DESTROY,
+            retention=logs.RetentionDays.ONE_MONTH,
+        )
+
+        function = _lambda.Function(
+            self,
+            "SubscriptionsFunction",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="subscriptions.on_event",
+            code=self._function_code,
+            environment={
+                "POWERTOOLS_SERVICE_NAME": "subscriptions",
+                "POWERTOOLS_LOG_LEVEL": "INFO",
+            },
+            log_group=log_group,
+            logging_format=_lambda.LoggingFormat.JSON,
+            timeout=Duration.minutes(1),
+        )
+
+        function.add_to_role_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=[
+                    "sns:Subscribe",
+                    "sns:Unsubscribe",
+                    "sns:ListSubscriptionsByTopic",
+                ],
+                resources=[topic.topic_arn],
+            )
+        )
+
+        return function
+
+    def _create_scheduler_dead_letter_queue(self, notifications_topic: sns.Topic):
         dead_letter_queue = sqs.Queue(
             self,
             "SchedulerCommonDLQ",
             enforce_ssl=True,
+            retention_period=Duration.days(14),
+        )
+
+        # A dead-lettered invocation means some StackSets skipped their scheduled drift detection
+        dead_letter_alarm = cloudwatch.Alarm(
+            self,
+            "SchedulerDLQAlarm",
+            alarm_description="CloudFormation StackSet drift detections failed to start",
+            metric=dead_letter_queue.metric_approximate_number_of_messages_visible(
+                period=Duration.minutes(5),
+                statistic=cloudwatch.Stats.MAXIMUM,
+            ),
+            threshold=1,
+            evaluation_periods=1,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        )
+        dead_letter_alarm.add_alarm_action(cloudwatch_actions.SnsAction(notifications_topic))
+
+        return dead_letter_queue
+
+    def _create_dispatcher_function(self, dead_letter_queue: sqs.Queue):
+        # EventBridge Scheduler has no log destination of its own, so this is the single log
+        # group of the scheduled path
+        log_group = logs.LogGroup(
+            self,
+            "DispatcherFunctionLogGroup",
+            removal_policy=RemovalPolicy.DESTROY,
+            retention=logs.RetentionDays.ONE_WEEK,
+        )
+
+        # Replaces the default execution role, which may write to any log group
+        role = iam.Role(
+            self,
+            "DispatcherFunctionRole",
+            assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
+            inline_policies={
+                "Default": iam.PolicyDocument(
+                    statements=[
+                        iam.PolicyStatement(
+                            effect=iam.Effect.ALLOW,
+                            actions=["logs:CreateLogStream", "logs:PutLogEvents"],
+                            resources=[log_group.log_group_arn],
+                        ),
+                    ]
+                )
+            },
         )
 
+        function = _lambda.Function(
+            self,
+            "DispatcherFunction",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="dispatcher.lambda_handler",
+            code=self._function_code,
+            environment={
+                "POWERTOOLS_SERVICE_NAME": "dispatcher",
+                "POWERTOOLS_LOG_LEVEL": "INFO",
+            },
+            role=role,
+            log_group=log_group,
+            logging_format=_lambda.LoggingFormat.JSON,
+            timeout=DISPATCHER_FUNCTION_TIMEOUT,
+            # A retry would restart the drift detection of the StackSets that already succeeded,
+            # so failed calls are retried per StackSet by the client, and failed invocations go
+            # straight to the scheduler DLQ
+            retry_attempts=0,
+            on_failure=destinations.SqsDestination(dead_letter_queue),
+        )
+
+        function.add_to_role_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=["cloudformation:DetectStackSetDrift"],
+                resources=["*"],
+            )
+        )
+
+        return function
+
+    def _create_scheduler(
+        self, dispatcher_function: _lambda.Function, dead_letter_queue: sqs.Queue
+    ):
         role = iam.Role(
             self,
             "SchedulerRole",
@@ -96,8 +285,8 @@ class StacksetDriftDetectionStack(Stack):
                     statements=[
                         iam.PolicyStatement(
                             effect=iam.Effect.ALLOW,
-                            actions=["cloudformation:DetectStackSetDrift"],
-                            resources=["*"],
+                            actions=["lambda:InvokeFunction"],
+                            resources=[dispatcher_function.function_arn],
                         ),
                         iam.PolicyStatement(
                             effect=iam.Effect.ALLOW,
@@ -114,37 +303,72 @@ class StacksetDriftDetectionStack(Stack):
             "SchedulerGroup",
         )
 
-        schedules = []
-
-        for stackset_name in self._props.stackset_names:
-            schedule = scheduler.CfnSchedule(
-                self,
-                f"Scheduler{stackset_name}",
-                group_name=group.name,
-                target=scheduler.CfnSchedule.TargetProperty(
-                    arn="arn:aws:scheduler:::aws-sdk:cloudformation:detectStackSetDrift",
-                    input=json.dumps(
-                        {
-                            "StackSetName": stackset_name,
-                            "OperationPreferences": {
-                                "RegionConcurrencyType": "PARALLEL",
-                                "MaxConcurrentCount": 10,
-                                "ConcurrencyMode": "SOFT_FAILURE_TOLERANCE",
-                            },
-                        }
-                    ),
-                    role_arn=role.role_arn,
-                    dead_letter_config=scheduler.CfnSchedule.DeadLetterConfigProperty(
-                        arn=dead_letter_queue.queue_arn
-                    ),
+        # A single schedule triggers the dispatcher, which starts the drift detection of all
+        # the monitored StackSets
+        schedule = scheduler.CfnSchedule(
+            self,
+            "Scheduler",
+            group_name=group.name,
+            target=scheduler.CfnSchedule.TargetProperty(
+                arn=dispatcher_function.function_arn,
+                # Passed as the invocation payload rather than an environment variable, which
+                # would cap the StackSet names at the 4 KB environment limit
+                input=json.dumps({"StackSetNames": self._props.stackset_names}),
+                role_arn=role.role_arn,
+                dead_letter_config=scheduler.CfnSchedule.DeadLetterConfigProperty(
+                    arn=dead_letter_queue.queue_arn
                 ),
-                schedule_expression=self._props.schedule_expression,
-                flexible_time_window=scheduler.CfnSchedule.FlexibleTimeWindowProperty(mode="OFF"),
-            )
+            ),
+            schedule_expression=self._props.schedule_expression,
+            flexible_time_window=scheduler.CfnSchedule.FlexibleTimeWindowProperty(mode="OFF"),
+        )
+
+        return schedule
+
+    def _create_evaluation_queue(self, notifications_topic: sns.Topic):
+        dead_letter_queue = sqs.Queue(
+            self,
+            "EvaluationDLQ",
+            enforce_ssl=True,
+            # Dead-lettered messages keep their original enqueue time, so keep them for the
+            # maximum period to leave time to react to the alarm
+            retention_period=Duration.days(14),
+        )
+
+        # Events that repeatedly failed to evaluate land in the DLQ, so alert through the same
+        # (notifications) SNS topic instead of dropping them silently
+        dead_letter_alarm = cloudwatch.Alarm(
+            self,
+            "EvaluationDLQAlarm",
+            alarm_description="CloudFormation StackSet drift events failed to be evaluated",
+            metric=dead_letter_queue.metric_approximate_number_of_messages_visible(
+                period=Duration.minutes(5),
+                statistic=cloudwatch.Stats.MAXIMUM,
+            ),
+            threshold=1,
+            evaluation_periods=1,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        )
+        dead_letter_alarm.add_alarm_action(cloudwatch_actions.SnsAction(notifications_topic))
 
-            schedules.append(schedule)
+        queue = sqs.Queue(
+            self,
+            "EvaluationQueue",
+            enforce_ssl=True,
+            # Six times the function timeout plus the batching window, as recommended for SQS
+            # event sources
+            visibility_timeout=Duration.seconds(
+                6 * EVALUATION_FUNCTION_TIMEOUT.to_seconds()
+                + EVALUATION_BATCHING_WINDOW.to_seconds()
+            ),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=3,
+                queue=dead_letter_queue,
+            ),
+        )
 
-        return schedules
+        return queue
 
     def _create_evaluation_function(self, notifications_topic: sns.Topic):
         log_group = logs.LogGroup(
@@ -158,8 +382,11 @@ class StacksetDriftDetectionStack(Stack):
             self,
             "EvaluationFunction",
             runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
             handler="evaluation.lambda_handler",
-            code=_lambda.Code.from_asset("lib/lambda"),
+            code=self._function_code,
+            # Almost every invocation is a cold start, since drift events arrive in a weekly burst
+            snap_start=_lambda.SnapStartConf.ON_PUBLISHED_VERSIONS,
             environment={
                 "NOTIFICATION_TOPIC_ARN": notifications_topic.topic_arn,
                 "POWERTOOLS_SERVICE_NAME": "evaluation",
@@ -167,16 +394,7 @@ class StacksetDriftDetectionStack(Stack):
             },
             log_group=log_group,
             logging_format=_lambda.LoggingFormat.JSON,
-            timeout=Duration.seconds(5),
-            # If the function fails, send the message to the same (notifications) SNS topic
-            on_failure=destinations.SnsDestination(notifications_topic),
-            layers=[
-                _lambda.LayerVersion.from_layer_version_arn(
-                    self,
-                    "PowertoolsLambdaLayer",
-                    f"arn:aws:lambda:{self.region}:017000801446:layer:AWSLambdaPowertoolsPythonV3-python312-x86_64:8",
-                )
-            ],
+            timeout=EVALUATION_FUNCTION_TIMEOUT,
         )
 
         function.add_to_role_policy(
@@ -190,6 +408,7 @@ class StacksetDriftDetectionStack(Stack):
         function.add_to_role_policy(
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
+                # Also authorizes sns:PublishBatch
                 actions=["sns:Publish"],
                 resources=[notifications_topic.topic_arn],
             )
@@ -198,8 +417,12 @@ class StacksetDriftDetectionStack(Stack):
         return function
 
     def _create_drift_status_eb_rule(self):
-        stackset_arns = [
-            f"arn:aws:cloudformation:{self.region}:{self.account}:stackset/{stackset_name}:*"
+        # StackSet ARNs end with a generated ID, so each StackSet is matched by the
+        # "<name>:" prefix, which is cheaper to evaluate than the equivalent wildcard. The event
+        # has no stack-set-name field to match exactly, and a single account-wide prefix would
+        # also match the StackSets that are not monitored.
+        stackset_arn_prefixes = [
+            f"arn:aws:cloudformation:{self.region}:{self.account}:stackset/{stackset_name}:"
             for stackset_name in self._props.stackset_names
         ]
 
@@ -213,7 +436,7 @@ class StacksetDriftDetectionStack(Stack):
                 source=["aws.cloudformation"],
                 detail={
                     "action": ["DETECT_DRIFT"],
-                    "stack-set-arn": [{"wildcard": arn} for arn in stackset_arns],
+                    "stack-set-arn": [{"prefix": prefix} for prefix in stackset_arn_prefixes],
                     "status-details": {"status": ["SUCCEEDED", "FAILED", "STOPPED"]},
                 },
             ),
@@ -226,8 +449,20 @@ class StacksetDriftDetectionStack(Stack):
         return self._notification_topic
 
     @property
-    def schedulers(self):
-        return self._schedulers
+    def scheduler(self):
+        return self._scheduler
+
+    @property
+    def dispatcher_function(self):
+        return self._dispatcher_function
+
+    @property
+    def evaluation_queue(self):
+        return self._evaluation_queue
+
+    @property
+    def evaluation_function_alias(self):
+        return self._evaluation_function_alias
 
     @property
     def drift_status_rule(self):
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The Lambda handlers read their configuration and create their clients at import time
+os.environ.setdefault("AWS_REGION", "eu-west-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("NOTIFICATION_TOPIC_ARN", "arn:aws:sns:eu-west-1:123456789012:DeliveryTopic")
+
+# "lambda" is a reserved word, so the handlers are imported as top-level modules like in Lambda
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib", "lambda"))
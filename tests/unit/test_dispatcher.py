@@ -0,0 +1,48 @@
+from unittest import mock
+
+import dispatcher
+import pytest
+from botocore.exceptions import ClientError
+
+
+def detect_stack_set_drift(StackSetName, OperationPreferences):
+    assert OperationPreferences == dispatcher.OPERATION_PREFERENCES
+
+    if StackSetName == "InProgress":
+        raise ClientError(
+            {"Error": {"Code": "OperationInProgressException", "Message": "In progress"}},
+            "DetectStackSetDrift",
+        )
+
+    return {"OperationId": f"{StackSetName}-operation"}
+
+
+@pytest.fixture(name="cfn_client")
+def fixture_cfn_client():
+    # StackSets are dispatched concurrently, so the responses are keyed by StackSet
+    with mock.patch.object(
+        dispatcher.cfn_client,
+        "detect_stack_set_drift",
+        side_effect=detect_stack_set_drift,
+    ) as detect:
+        yield detect
+
+
+def test_lambda_handler_starts_every_stackset(cfn_client):
+    dispatcher.lambda_handler({"StackSetNames": ["First", "Second"]}, None)
+
+    assert sorted(call.kwargs["StackSetName"] for call in cfn_client.call_args_list) == [
+        "First",
+        "Second",
+    ]
+
+
+def test_lambda_handler_raises_after_starting_the_remaining_stacksets(cfn_client):
+    with pytest.raises(RuntimeError, match="StackSets: InProgress$"):
+        dispatcher.lambda_handler({"StackSetNames": ["First", "InProgress", "Second"]}, None)
+
+    assert sorted(call.kwargs["StackSetName"] for call in cfn_client.call_args_list) == [
+        "First",
+        "InProgress",
+        "Second",
+    ]
@@ -0,0 +1,160 @@
+import datetime
+import json
+from unittest import mock
+
+import evaluation
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+ACCOUNT_ID = "123456789012"
+
+
+def make_record(message_id: str, stackset_name: str) -> dict:
+    return {
+        "messageId": message_id,
+        "body": json.dumps(
+            {
+                "detail": {
+                    "stack-set-arn": f"arn:aws:cloudformation:eu-west-1:{ACCOUNT_ID}:stackset/"
+                    f"{stackset_name}:11111111-2222-3333-4444-555555555555",
+                    "stack-set-operation-id": f"{stackset_name}-operation",
+                }
+            }
+        ),
+    }
+
+
+def make_operation(stackset_name: str, status: str, drift_status: str) -> dict:
+    return {
+        "OperationId": f"{stackset_name}-operation",
+        "StackSetId": stackset_name,
+        "Status": status,
+        "StackSetDriftDetectionDetails": {"DriftStatus": drift_status},
+    }
+
+
+OPERATIONS = {
+    "Drifted": make_operation("Drifted", "SUCCEEDED", "DRIFTED"),
+    "InSync": make_operation("InSync", "SUCCEEDED", "IN_SYNC"),
+    "Failed": make_operation("Failed", "FAILED", "NOT_CHECKED"),
+    "Unpublished": make_operation("Unpublished", "SUCCEEDED", "DRIFTED"),
+}
+
+
+def describe_stack_set_operation(StackSetName, OperationId, CallAs):
+    assert OperationId == f"{StackSetName}-operation"
+    assert CallAs == "SELF"
+
+    if StackSetName not in OPERATIONS:
+        raise ClientError(
+            {"Error": {"Code": "OperationNotFoundException", "Message": "Not found"}},
+            "DescribeStackSetOperation",
+        )
+
+    return {"StackSetOperation": OPERATIONS[StackSetName]}
+
+
+@pytest.fixture(name="cfn_client")
+def fixture_cfn_client():
+    # Records are evaluated concurrently, so the responses are keyed by StackSet rather than queued
+    with mock.patch.object(
+        evaluation.cfn_client,
+        "describe_stack_set_operation",
+        side_effect=describe_stack_set_operation,
+    ) as describe:
+        yield describe
+
+
+@pytest.fixture(name="sns_stubber")
+def fixture_sns_stubber():
+    with Stubber(evaluation.sns_client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def expected_entry(message_id: str, subject: str, stackset_name: str) -> dict:
+    return {
+        "Id": message_id,
+        "Subject": subject,
+        "Message": orjson.dumps(OPERATIONS[stackset_name]).decode(),
+    }
+
+
+def test_lambda_handler_reports_evaluation_and_publish_failures(cfn_client, sns_stubber):
+    sns_stubber.add_response(
+        "publish_batch",
+        {
+            "Successful": [
+                {"Id": "drifted", "MessageId": "1"},
+                {"Id": "failed", "MessageId": "2"},
+            ],
+            "Failed": [{"Id": "unpublished", "Code": "InternalError", "SenderFault": False}],
+        },
+        {
+            "TopicArn": evaluation.NOTIFICATION_TOPIC_ARN,
+            "PublishBatchRequestEntries": [
+                expected_entry(
+                    "drifted", "DRIFTED: StackSet Drifted is in the drifted state", "Drifted"
+                ),
+                expected_entry("failed", "ERROR: StackSet Failed drift detection failed", "Failed"),
+                expected_entry(
+                    "unpublished",
+                    "DRIFTED: StackSet Unpublished is in the drifted state",
+                    "Unpublished",
+                ),
+            ],
+        },
+    )
+
+    response = evaluation.lambda_handler(
+        {
+            "Records": [
+                make_record("drifted", "Drifted"),
+                make_record("in-sync", "InSync"),
+                make_record("failed", "Failed"),
+                make_record("missing", "Missing"),
+                {"messageId": "malformed", "body": "not json"},
+                make_record("unpublished", "Unpublished"),
+            ]
+        },
+        None,
+    )
+
+    assert response == {
+        "batchItemFailures": [
+            {"itemIdentifier": "missing"},
+            {"itemIdentifier": "malformed"},
+            {"itemIdentifier": "unpublished"},
+        ]
+    }
+    assert cfn_client.call_count == 5
+
+
+def test_lambda_handler_does_not_publish_when_in_sync(cfn_client, sns_stubber):
+    response = evaluation.lambda_handler({"Records": [make_record("in-sync", "InSync")]}, None)
+
+    assert response == {"batchItemFailures": []}
+    cfn_client.assert_called_once()
+
+
+def test_publish_to_topic_sends_the_bare_operation_details(sns_stubber):
+    operation = {"Status": "SUCCEEDED", "EndTimestamp": datetime.datetime(2024, 1, 1, 5, 0)}
+
+    sns_stubber.add_response(
+        "publish_batch",
+        {"Successful": [{"Id": "id", "MessageId": "1"}], "Failed": []},
+        {
+            "TopicArn": evaluation.NOTIFICATION_TOPIC_ARN,
+            "PublishBatchRequestEntries": [
+                {
+                    "Id": "id",
+                    "Subject": "subject",
+                    "Message": '{"Status":"SUCCEEDED","EndTimestamp":"2024-01-01T05:00:00+00:00"}',
+                }
+            ],
+        },
+    )
+
+    assert evaluation.publish_to_topic([("id", "subject", operation)]) == []
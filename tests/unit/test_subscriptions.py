@@ -0,0 +1,95 @@
+from unittest import mock
+
+import pytest
+import subscriptions
+
+TOPIC_ARN = "arn:aws:sns:eu-west-1:123456789012:DeliveryTopic"
+NEW_TOPIC_ARN = "arn:aws:sns:eu-west-1:123456789012:NewDeliveryTopic"
+
+EMAIL = {"Protocol": "email-json", "Endpoint": "security@examplecorp.com"}
+WEBHOOK = {"Protocol": "https", "Endpoint": "https://security.webhook.examplecorp.com"}
+NEW_WEBHOOK = {"Protocol": "https", "Endpoint": "https://drift.webhook.examplecorp.com"}
+PENDING_EMAIL = {"Protocol": "email-json", "Endpoint": "pending@examplecorp.com"}
+
+
+@pytest.fixture(name="sns_client")
+def fixture_sns_client():
+    # Subscriptions are (un)subscribed concurrently, so the client is mocked rather than stubbed
+    with mock.patch.object(subscriptions, "sns_client") as sns_client:
+        sns_client.subscribe.side_effect = lambda TopicArn, Protocol, Endpoint, **_: {
+            "SubscriptionArn": f"{TopicArn}:{Endpoint}"
+        }
+        sns_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Subscriptions": [
+                    {**EMAIL, "SubscriptionArn": f"{TOPIC_ARN}:email"},
+                    {**WEBHOOK, "SubscriptionArn": f"{TOPIC_ARN}:webhook"},
+                    {**PENDING_EMAIL, "SubscriptionArn": "PendingConfirmation"},
+                ]
+            }
+        ]
+        yield sns_client
+
+
+def subscribed_endpoints(sns_client) -> list[tuple[str, str, str]]:
+    return sorted(
+        (call.kwargs["TopicArn"], call.kwargs["Protocol"], call.kwargs["Endpoint"])
+        for call in sns_client.subscribe.call_args_list
+    )
+
+
+def unsubscribed_arns(sns_client) -> list[str]:
+    return sorted(call.kwargs["SubscriptionArn"] for call in sns_client.unsubscribe.call_args_list)
+
+
+def test_on_event_update_applies_the_subscriptions_diff(sns_client):
+    response = subscriptions.on_event(
+        {
+            "RequestType": "Update",
+            "ResourceProperties": {"TopicArn": TOPIC_ARN, "Subscriptions": [WEBHOOK, NEW_WEBHOOK]},
+            "OldResourceProperties": {
+                "TopicArn": TOPIC_ARN,
+                "Subscriptions": [EMAIL, WEBHOOK, PENDING_EMAIL],
+            },
+        },
+        None,
+    )
+
+    assert response == {"PhysicalResourceId": TOPIC_ARN}
+    assert subscribed_endpoints(sns_client) == [
+        (TOPIC_ARN, NEW_WEBHOOK["Protocol"], NEW_WEBHOOK["Endpoint"])
+    ]
+    # The pending subscription has no ARN to unsubscribe
+    assert unsubscribed_arns(sns_client) == [f"{TOPIC_ARN}:email"]
+
+
+def test_on_event_update_resubscribes_everything_on_topic_change(sns_client):
+    response = subscriptions.on_event(
+        {
+            "RequestType": "Update",
+            "ResourceProperties": {"TopicArn": NEW_TOPIC_ARN, "Subscriptions": [EMAIL, WEBHOOK]},
+            "OldResourceProperties": {"TopicArn": TOPIC_ARN, "Subscriptions": [EMAIL, WEBHOOK]},
+        },
+        None,
+    )
+
+    # The new physical ID makes CloudFormation delete the old subscriptions afterwards
+    assert response == {"PhysicalResourceId": NEW_TOPIC_ARN}
+    assert subscribed_endpoints(sns_client) == [
+        (NEW_TOPIC_ARN, EMAIL["Protocol"], EMAIL["Endpoint"]),
+        (NEW_TOPIC_ARN, WEBHOOK["Protocol"], WEBHOOK["Endpoint"]),
+    ]
+    sns_client.unsubscribe.assert_not_called()
+
+
+def test_on_event_delete_unsubscribes_the_endpoints(sns_client):
+    subscriptions.on_event(
+        {
+            "RequestType": "Delete",
+            "ResourceProperties": {"TopicArn": TOPIC_ARN, "Subscriptions": [EMAIL, WEBHOOK]},
+        },
+        None,
+    )
+
+    sns_client.subscribe.assert_not_called()
+    assert unsubscribed_arns(sns_client) == [f"{TOPIC_ARN}:email", f"{TOPIC_ARN}:webhook"]